@@ -1,10 +1,24 @@
-import redis
+from functools import lru_cache
+import redis.asyncio as redis
 from app.core.config import settings
 
 
-def get_redis_client() -> redis.Redis:
-    return redis.Redis(
+def create_pool() -> redis.BlockingConnectionPool:
+    # Blocking pool: when every connection is checked out, callers wait up
+    # to redis_pool_timeout for one to be released instead of failing
+    return redis.BlockingConnectionPool(
         host=settings.redis_host,
         port=settings.redis_port,
         decode_responses=True,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
     )
+
+
+# One pool per process, shared by every module that talks to Redis
+_POOL = create_pool()
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=_POOL)
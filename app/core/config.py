@@ -6,6 +6,8 @@ class Settings(BaseSettings):
     
     redis_host: str = "localhost"
     redis_port: int = 6379
+    redis_max_connections: int = 64
+    redis_pool_timeout: float = 5.0
 
     RATE_LIMIT_REQUESTS: int = 20
     RATE_LIMIT_WINDOW_SEC: int = 30
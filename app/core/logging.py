@@ -1,23 +1,41 @@
 import sys
+import orjson
 from loguru import logger
 
 
+def json_sink(message):
+    record = message.record
+
+    payload = {
+        "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+        "level": record["level"].name,
+        "message": record["message"],
+        "module": record["module"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    if record["exception"]:
+        # The sink's format renders only the traceback, before the record
+        # is queued (the traceback object itself does not survive enqueue)
+        payload["exception"] = str(message)
+
+    # orjson emits bytes directly, skipping the str -> bytes encode
+    sys.stdout.buffer.write(
+        orjson.dumps(payload, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    )
+    sys.stdout.flush()
+
+
 def setup_logging():
     logger.remove()
 
+    # enqueue=True hands the write off to a background thread so request
+    # handlers never block on stdout
     logger.add(
-        sys.stdout,
-        format=(
-            '{{'
-            '"time":"{time:YYYY-MM-DD HH:mm:ss}",'
-            '"level":"{level}",'
-            '"message":"{message}",'
-            '"request_id":"{extra[request_id]}",'
-            '"module":"{module}",'
-            '"function":"{function}",'
-            '"line":{line}'
-            '}}'
-        ),
+        json_sink,
+        format=lambda _: "{exception}",
+        enqueue=True,
         level="INFO",
     )
 
@@ -1,6 +1,11 @@
-from prometheus_client import Counter, Histogram
+import os
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
 
 
+# Set when running several uvicorn workers; each worker then writes its
+# samples to this directory and /metrics aggregates them.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
 REQUEST_COUNT = Counter(
     'http_requests_total', 'Total HTTP Requests',
     ['method', 'endpoint', 'http_status'],
@@ -10,6 +15,20 @@ REQUEST_COUNT = Counter(
 REQUEST_LATENCY = Histogram(
     "http_request_latency_ms",
     "HTTP Request Latency in milliseconds",
-    ['method', 'endpoint'],
-    buckets=(5, 10, 25, 50, 100, 250, 500, 1000),
+    ['endpoint'],
+    buckets=(5, 25, 100, 500, 1000),
 )
+
+
+def get_registry() -> CollectorRegistry:
+    if not MULTIPROC_DIR:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead():
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
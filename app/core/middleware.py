@@ -1,63 +1,138 @@
 import time
-import uuid
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response, JSONResponse
+from secrets import token_hex
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.logging import setup_logging
+from prometheus_client import Counter, Histogram
 from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY
 from app.gateway.rate_limiter import is_rate_limited
 
 
 logger = setup_logging()
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
+# Probe and scrape endpoints skip rate limiting and request metrics
+UNMETERED_PATHS = frozenset({"/metrics", "/health"})
+
+# The method is client-controlled; anything else is labelled "other" so
+# arbitrary method strings cannot create new series
+METRIC_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# Pre-serialized 429 response, sent as raw ASGI messages so a flood from a
+# blocked client costs no JSON encoding or Response allocation
+_RATE_LIMITED_BODY = b'{"detail":"Rate limit exceeded"}'
+_RATE_LIMITED_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_RATE_LIMITED_BODY)).encode()),
+)
+
+# Resolved metric children keyed by label values, so each request does a
+# single dict lookup instead of going through .labels(). Bounded by route
+# templates x METRIC_METHODS x status codes.
+_count_cache: dict[tuple, Counter] = {}
+_latency_cache: dict[str, Histogram] = {}
+
+
+def _count(method: str, endpoint: str, status: int) -> Counter:
+    key = (method, endpoint, status)
+    child = _count_cache.get(key)
+    if child is None:
+        child = _count_cache[key] = REQUEST_COUNT.labels(
+            method=method,
+            endpoint=endpoint,
+            http_status=status
+        )
+    return child
+
+
+def _latency(endpoint: str) -> Histogram:
+    child = _latency_cache.get(endpoint)
+    if child is None:
+        child = _latency_cache[endpoint] = REQUEST_LATENCY.labels(
+            endpoint=endpoint
+        )
+    return child
+
+class RequestContextMiddleware:
+    # Plain ASGI middleware: avoids the task group and memory stream that
+    # BaseHTTPMiddleware sets up for every request
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = token_hex(16)
         start_time = time.perf_counter()
 
         # attach request ID to request state
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        unmetered = scope["path"] in UNMETERED_PATHS
 
         # Rate limiting
-        client_ip = request.client.host
-        if is_rate_limited(client_ip):
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded"}
-            )
+        if not unmetered:
+            client_ip = scope["client"][0]
+            if await is_rate_limited(client_ip):
+                await send({
+                    "type": "http.response.start",
+                    "status": 429,
+                    "headers": list(_RATE_LIMITED_HEADERS),
+                })
+                await send({
+                    "type": "http.response.body",
+                    "body": _RATE_LIMITED_BODY,
+                })
+                return
+
+        # Filled in when the response headers go out
+        process_time_ms = 0.0
+        process_time = 0.0
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal process_time_ms, process_time, status
+
+            if message["type"] == "http.response.start":
+                # add custom headers to response
+                process_time_ms = (time.perf_counter() - start_time) * 1000
+                process_time = round(process_time_ms, 2)
+                status = message["status"]
+
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("X-Process-Time", f"{process_time}")
+
+            await send(message)
 
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            logger.exception("Unhandled exception occurred",
-                              extra={"request_id": request_id}
-                )
+            logger.bind(request_id=request_id).exception(
+                "Unhandled exception occurred"
+            )
             raise e
-        
-        # add custom headers to response
-        process_time_ms = (time.perf_counter() - start_time) * 1000
+
+        method = scope["method"]
+
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = scope.get("route")
+        endpoint_label = getattr(route, "path", "unmatched")
 
         # Update Prometheus metrics
-        REQUEST_COUNT.labels(
-            method=request.method,
-            endpoint=str(request.url.path),
-            http_status=response.status_code
-        ).inc()
-
-        REQUEST_LATENCY.labels(
-            method=request.method,
-            endpoint=str(request.url.path)
-        ).observe(process_time_ms)
-
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = str(round(process_time_ms, 2))
-
-        logger.bind(request_id=request_id).info("Request processed Successfully",
-                     extra={"request_id": request_id,
-                             "process_time": round(process_time_ms, 2),
-                             "status_code": response.status_code,
-                             "method": request.method,
-                             "url": str(request.url),
-                             "latency": round(process_time_ms, 2)}
+        if not unmetered:
+            metric_method = method if method in METRIC_METHODS else "other"
+            _count(metric_method, endpoint_label, status).inc()
+            _latency(endpoint_label).observe(process_time_ms)
+
+        # Already-computed values are bound directly; only the URL, which
+        # has to be rebuilt from the scope, is deferred until INFO is enabled
+        logger.bind(
+            request_id=request_id,
+            status_code=status,
+            method=method,
+            latency=process_time,
+        ).opt(lazy=True).info("Request processed Successfully",
+                     url=lambda: str(URL(scope=scope)),
             )
-        return response
\ No newline at end of file
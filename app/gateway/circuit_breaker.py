@@ -1,38 +1,68 @@
-import time
 from app.cache.redis_client import get_redis_client
 from app.core.config import settings
 
 redis_client = get_redis_client()
 
+# Check the state and move OPEN -> HALF_OPEN once the timeout has elapsed,
+# atomically so concurrent workers agree on the transition.
+# Timestamps come from the Redis server clock (TIME, integer microseconds) so
+# every worker measures the recovery timeout against the same clock.
+# KEYS = state, opened_at; ARGV = recovery_timeout_us
+IS_OPEN_LUA = """
+local state = redis.call('GET', KEYS[1])
+if state == 'OPEN' then
+    local opened_at = redis.call('GET', KEYS[2])
+    local now = redis.call('TIME')
+    local now_us = tonumber(now[1]) * 1000000 + tonumber(now[2])
+    if opened_at and (now_us - tonumber(opened_at)) > tonumber(ARGV[1]) then
+        redis.call('SET', KEYS[1], 'HALF_OPEN')
+        return 0
+    end
+    return 1
+end
+return 0
+"""
+
+# Count the failure and open the circuit when the threshold is crossed.
+# KEYS = failures, state, opened_at; ARGV = threshold
+RECORD_FAILURE_LUA = """
+local failures = redis.call('INCR', KEYS[1])
+if failures >= tonumber(ARGV[1]) then
+    local now = redis.call('TIME')
+    redis.call('SET', KEYS[2], 'OPEN')
+    redis.call('SET', KEYS[3], now[1] .. string.format('%06d', now[2]))
+end
+return failures
+"""
+
+is_open_script = redis_client.register_script(IS_OPEN_LUA)
+record_failure_script = redis_client.register_script(RECORD_FAILURE_LUA)
+
 
 class CircuitBreaker:
     def __init__(self, service_name: str):
         self.service_name = service_name
-        self.failure_key = f"circuit:{service_name}:failures"
-        self.state_key = f"circuit:{service_name}:state"
-        self.opened_at_key = f"circuit:{service_name}:opened_at"
-
-    def is_open(self) -> bool:
-        state = redis_client.get(self.state_key)
-
-        if state == "OPEN":
-            opened_at = redis_client.get(self.opened_at_key)
-            if opened_at and (
-                time.time() - float(opened_at)
-            ) > settings.CIRCUIT_RECOVERY_TIMEOUT:
-                redis_client.set(self.state_key, "HALF_OPEN")
-                return False
-            return True
-
-        return False
-
-    def record_failure(self):
-        failures = redis_client.incr(self.failure_key)
-
-        if failures >= settings.CIRCUIT_FAILURE_THRESHOLD:
-            redis_client.set(self.state_key, "OPEN")
-            redis_client.set(self.opened_at_key, time.time())
-
-    def record_success(self):
-        redis_client.set(self.failure_key, 0)
-        redis_client.set(self.state_key, "CLOSED")
+        # {service_name} is a Redis Cluster hash tag: it keeps all three keys
+        # in one slot so the scripts and pipelines below work on a cluster
+        self.failure_key = f"circuit:{{{service_name}}}:failures"
+        self.state_key = f"circuit:{{{service_name}}}:state"
+        self.opened_at_key = f"circuit:{{{service_name}}}:opened_at"
+
+    async def is_open(self) -> bool:
+        is_open = await is_open_script(
+            keys=[self.state_key, self.opened_at_key],
+            args=[settings.CIRCUIT_RECOVERY_TIMEOUT * 1_000_000],
+        )
+        return is_open == 1
+
+    async def record_failure(self):
+        await record_failure_script(
+            keys=[self.failure_key, self.state_key, self.opened_at_key],
+            args=[settings.CIRCUIT_FAILURE_THRESHOLD],
+        )
+
+    async def record_success(self):
+        async with redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.set(self.failure_key, 0)
+            pipeline.set(self.state_key, "CLOSED")
+            await pipeline.execute()
@@ -4,17 +4,18 @@ from app.core.config import settings
 
 redis_client = get_redis_client()
 
-def is_rate_limited(client_ip: str) ->bool:
+async def is_rate_limited(client_ip: str) ->bool:
     
-    key = f"rate_limit:{client_ip}"
-    current_ts = int(time.time())
+    # Fixed window: one counter per client per window bucket. Wall clock
+    # (not monotonic) so every worker agrees on the bucket boundaries.
+    current_ts = time.time_ns() // 1_000_000_000
+    bucket = current_ts // settings.RATE_LIMIT_WINDOW_SEC
+    key = f"rl:{client_ip}:{bucket}"
 
-    pipeline = redis_client.pipeline()
-    pipeline.zremrangebyscore(key, 0 , current_ts - settings.RATE_LIMIT_WINDOW_SEC)
-    pipeline.zadd(key, {str(current_ts): current_ts})
-    pipeline.zcard(key)
-    pipeline.expire(key, settings.RATE_LIMIT_WINDOW_SEC + 1)
-    _, _, request_count, _ = pipeline.execute()
+    async with redis_client.pipeline(transaction=False) as pipeline:
+        pipeline.incr(key)
+        pipeline.expire(key, settings.RATE_LIMIT_WINDOW_SEC + 1)
+        request_count, _ = await pipeline.execute()
 
     return request_count > settings.RATE_LIMIT_REQUESTS
 
@@ -1,24 +1,69 @@
 import asyncio
+import math
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import httpx
 
+# Methods that are safe to send more than once
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Statuses that indicate a transient downstream condition
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # nan/inf would slip through max()/min() and reach asyncio.sleep
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # Dates with a -0000 zone parse as naive; HTTP dates are always UTC
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
 async def retry_request(
+        client: httpx.AsyncClient,
         url: str,
+        method: str = "GET",
         max_retries: int = 3,
         base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retry_statuses: frozenset[int] = RETRY_STATUSES,
 ):
-    last_exception = None
+    # Non-idempotent requests get a single attempt
+    attempts = max_retries if method.upper() in IDEMPOTENT_METHODS else 1
+
+    for attempt in range(attempts):
+        is_last_attempt = attempt == attempts - 1
+        retry_after = None
 
-    for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-            if response.status_code < 500:
+            response = await client.request(method, url)
+        except httpx.RequestError:
+            if is_last_attempt:
+                raise
+        else:
+            if response.status_code not in retry_statuses or is_last_attempt:
                 return response
-            raise Exception(f"Server error: {response.status_code}")
-        except (httpx.RequestError, httpx.HTTPStatusError) as e:
-            last_exception = e
-            
-            if attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                await asyncio.sleep(delay)
-    raise last_exception
\ No newline at end of file
+            retry_after = parse_retry_after(response)
+
+        # Full jitter spreads retries from many clients over the whole window
+        if retry_after is None:
+            delay = random.uniform(0, base_delay * (2 ** attempt))
+        else:
+            delay = retry_after
+        await asyncio.sleep(min(delay, max_delay))
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Response , HTTPException
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 from .core.middleware import RequestContextMiddleware
 from .core.logging import setup_logging
+from .core.metrics import get_registry, mark_process_dead
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 import httpx
 from app.gateway.circuit_breaker import CircuitBreaker
@@ -15,12 +17,23 @@ logger = setup_logging().bind(request_id="system")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Shared client so downstream calls reuse keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
     logger.info("API Gateway startup complete")
     yield
     # Shutdown
+    await app.state.http.aclose()
+    mark_process_dead()
     logger.info("API Gateway shutting down")
 
-app = FastAPI(title="My API Gateway", lifespan=lifespan)
+app = FastAPI(
+    title="My API Gateway",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(RequestContextMiddleware)
 
@@ -38,7 +51,7 @@ def health_check():
 @app.get("/metrics")
 def metrics():
     return Response(
-        generate_latest(),
+        generate_latest(get_registry()),
         media_type=CONTENT_TYPE_LATEST
         )
 # Mock downstream service failure simulation
@@ -53,7 +66,7 @@ def enable_failure():
         "status": "failure_mode_enabled",
         "timestamp": datetime.now().isoformat(),
         "message": "Downstream service failure simulation is now ACTIVE",
-        "what_is_happening": "All requests to /downstream will return HTTP 500 errors",
+        "what_is_happening": "All requests to /downstream will return HTTP 503 errors",
         "next_action": "Test your error handling and circuit breaker by calling /proxy or /downstream endpoints",
         "to_recover": "Call POST /simulate-recovery when ready to restore normal operation"
     }
@@ -76,7 +89,7 @@ def disable_failure():
 def mock_downstream():
     if failure_mode["enabled"]:
         raise HTTPException(
-            status_code=500,
+            status_code=503,
             detail={
                 "status": "downstream_unavailable",
                 "timestamp": datetime.now().isoformat(),
@@ -97,7 +110,7 @@ def mock_downstream():
 async def proxy_request():
     breaker = CircuitBreaker("downstream_service")
 
-    if breaker.is_open():
+    if await breaker.is_open():
         raise HTTPException(
             status_code=503,
             detail={
@@ -111,10 +124,10 @@ async def proxy_request():
         )
 
     try:
-        response = await retry_request("http://127.0.0.1:8000/downstream")
+        response = await retry_request(app.state.http, "http://127.0.0.1:8000/downstream")
 
         if response.status_code >= 500:
-            breaker.record_failure()
+            await breaker.record_failure()
             raise HTTPException(
                 status_code=502,
                 detail={
@@ -128,7 +141,7 @@ async def proxy_request():
                 }
             )
 
-        breaker.record_success()
+        await breaker.record_success()
         return {
             "status": "success",
             "timestamp": datetime.now().isoformat(),
@@ -138,8 +151,10 @@ async def proxy_request():
             "next_action": "Process the response from the downstream service"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        breaker.record_failure()
+        await breaker.record_failure()
         raise HTTPException(
             status_code=503,
             detail={
@@ -1,68 +1,107 @@
 from unittest.mock import patch
+import asyncio
 import time
-from app.gateway.circuit_breaker import CircuitBreaker
+from fakeredis import FakeAsyncRedis
+from app.gateway.circuit_breaker import (
+    CircuitBreaker,
+    IS_OPEN_LUA,
+    RECORD_FAILURE_LUA,
+)
 from app.core.config import settings
 
 
+def run_with_fake_redis(test):
+    # Runs the real Lua scripts against an in-memory Redis
+    async def runner():
+        fake_redis = FakeAsyncRedis(decode_responses=True)
+        with patch("app.gateway.circuit_breaker.redis_client", fake_redis), \
+                patch("app.gateway.circuit_breaker.is_open_script",
+                      fake_redis.register_script(IS_OPEN_LUA)), \
+                patch("app.gateway.circuit_breaker.record_failure_script",
+                      fake_redis.register_script(RECORD_FAILURE_LUA)):
+            await test(fake_redis, CircuitBreaker("test_service"))
+
+    asyncio.run(runner())
+
+
 def test_circuit_starts_closed():
-    with patch("app.gateway.circuit_breaker.redis_client") as mock_redis:
-        mock_redis.get.return_value = None
+    async def test(fake_redis, breaker):
+        assert await breaker.is_open() is False
+
+    run_with_fake_redis(test)
+
 
-        breaker = CircuitBreaker("test_service")
+def test_circuit_stays_closed_below_threshold():
+    async def test(fake_redis, breaker):
+        for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD - 1):
+            await breaker.record_failure()
 
-        assert breaker.is_open() is False
+        assert await breaker.is_open() is False
+        assert await fake_redis.get("circuit:{test_service}:state") is None
+
+    run_with_fake_redis(test)
 
 
 def test_circuit_opens_after_threshold():
-    with patch("app.gateway.circuit_breaker.redis_client") as mock_redis:
-        # Simulate increasing failure count
-        mock_redis.incr.side_effect = list(
-            range(1, settings.CIRCUIT_FAILURE_THRESHOLD + 1)
-        )
-        mock_redis.get.return_value = None
+    async def test(fake_redis, breaker):
+        for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+            await breaker.record_failure()
+
+        assert await fake_redis.get("circuit:{test_service}:state") == "OPEN"
+        assert await breaker.is_open() is True
+
+    run_with_fake_redis(test)
 
-        breaker = CircuitBreaker("test_service")
 
+def test_opened_at_is_server_time_in_microseconds():
+    async def test(fake_redis, breaker):
+        before_us = int(time.time() * 1_000_000)
         for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
-            breaker.record_failure()
+            await breaker.record_failure()
+        after_us = int(time.time() * 1_000_000)
 
-        mock_redis.set.assert_any_call(
-            "circuit:test_service:state", "OPEN"
-        )
+        opened_at = await fake_redis.get("circuit:{test_service}:opened_at")
+
+        assert opened_at.isdigit()
+        assert before_us <= int(opened_at) <= after_us
+
+    run_with_fake_redis(test)
 
 
 def test_open_circuit_blocks_requests():
-    with patch("app.gateway.circuit_breaker.redis_client") as mock_redis:
-        mock_redis.get.side_effect = ["OPEN", str(time.time())]
+    async def test(fake_redis, breaker):
+        opened_at_us = int(time.time() * 1_000_000)
+        await fake_redis.set("circuit:{test_service}:state", "OPEN")
+        await fake_redis.set("circuit:{test_service}:opened_at", opened_at_us)
 
-        breaker = CircuitBreaker("test_service")
+        assert await breaker.is_open() is True
 
-        assert breaker.is_open() is True
+    run_with_fake_redis(test)
 
 
 def test_circuit_moves_to_half_open_after_timeout():
-    with patch("app.gateway.circuit_breaker.redis_client") as mock_redis:
+    async def test(fake_redis, breaker):
         old_time = time.time() - (settings.CIRCUIT_RECOVERY_TIMEOUT + 5)
+        await fake_redis.set("circuit:{test_service}:state", "OPEN")
+        await fake_redis.set(
+            "circuit:{test_service}:opened_at", int(old_time * 1_000_000)
+        )
 
-        mock_redis.get.side_effect = ["OPEN", str(old_time)]
-
-        breaker = CircuitBreaker("test_service")
+        assert await breaker.is_open() is False
+        assert await fake_redis.get("circuit:{test_service}:state") == "HALF_OPEN"
 
-        assert breaker.is_open() is False
-        mock_redis.set.assert_any_call(
-            "circuit:test_service:state", "HALF_OPEN"
-        )
+    run_with_fake_redis(test)
 
 
 def test_success_resets_circuit():
-    with patch("app.gateway.circuit_breaker.redis_client") as mock_redis:
-        breaker = CircuitBreaker("test_service")
+    async def test(fake_redis, breaker):
+        for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+            await breaker.record_failure()
 
-        breaker.record_success()
+        await breaker.record_success()
 
-        mock_redis.set.assert_any_call(
-            "circuit:test_service:failures", 0
-        )
-        mock_redis.set.assert_any_call(
-            "circuit:test_service:state", "CLOSED"
-        )
+        assert await fake_redis.get("circuit:{test_service}:failures") == "0"
+        assert await fake_redis.get("circuit:{test_service}:state") == "CLOSED"
+        assert await breaker.is_open() is False
+
+    run_with_fake_redis(test)
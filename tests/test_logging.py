@@ -0,0 +1,24 @@
+import json
+from app.core.logging import setup_logging
+
+
+def fail():
+    raise ValueError("boom")
+
+
+def test_exception_log_includes_traceback(capsys):
+    logger = setup_logging()
+
+    try:
+        fail()
+    except ValueError:
+        logger.bind(request_id="test").exception("Unhandled exception occurred")
+    logger.complete()
+
+    line = json.loads(capsys.readouterr().out.splitlines()[-1])
+
+    assert line["message"] == "Unhandled exception occurred"
+    assert line["request_id"] == "test"
+    assert "Traceback" in line["exception"]
+    assert "in fail" in line["exception"]
+    assert "ValueError: boom" in line["exception"]
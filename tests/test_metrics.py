@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+from unittest.mock import patch
 from app.main import app
 
 client = TestClient(app)
@@ -9,10 +10,13 @@ def test_metrics_endpoint_exists():
     assert "http_requests_total" in response.text
 
 def test_request_metrics_increment():
-    # trigger request
-    client.get("/health")
+    with patch("app.core.middleware.is_rate_limited") as mock_limit:
+        mock_limit.return_value = False
+
+        # trigger request
+        client.get("/downstream")
+        response = client.get("/metrics")
 
-    response = client.get("/metrics")
     metrics = response.text
 
     assert response.status_code == 200
@@ -21,3 +25,22 @@ def test_request_metrics_increment():
     assert "http_request_latency_ms_count" in metrics
     assert "http_request_latency_ms_sum" in metrics
 
+def test_unmatched_paths_share_one_label():
+    with patch("app.core.middleware.is_rate_limited") as mock_limit:
+        mock_limit.return_value = False
+
+        client.get("/does-not-exist/123")
+        response = client.get("/metrics")
+
+    assert 'endpoint="unmatched"' in response.text
+    assert "/does-not-exist/123" not in response.text
+
+def test_unknown_methods_share_one_label():
+    with patch("app.core.middleware.is_rate_limited") as mock_limit:
+        mock_limit.return_value = False
+
+        client.request("BOGUS", "/downstream")
+        response = client.get("/metrics")
+
+    assert 'method="other"' in response.text
+    assert "BOGUS" not in response.text
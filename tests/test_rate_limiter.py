@@ -8,16 +8,25 @@ def test_request_allowed_under_rate_limit():
     with patch("app.core.middleware.is_rate_limited") as mock_limit:
         mock_limit.return_value = False
 
-        response = client.get("/health")
+        response = client.get("/downstream")
         
         assert response.status_code == 200
-        assert response.json() == {"status": "ok"}
+        assert response.json()["status"] == "success"
 
 def test_request_blocked_when_rate_limited():
     with patch("app.core.middleware.is_rate_limited") as mock_limit:
         mock_limit.return_value = True
 
-        response = client.get("/health")
+        response = client.get("/downstream")
 
         assert response.status_code == 429
         assert response.json()["detail"] == "Rate limit exceeded"
+
+def test_health_check_bypasses_rate_limit():
+    with patch("app.core.middleware.is_rate_limited") as mock_limit:
+        mock_limit.return_value = True
+
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        mock_limit.assert_not_called()
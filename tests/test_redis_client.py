@@ -0,0 +1,24 @@
+from unittest.mock import AsyncMock, patch
+import asyncio
+from app.cache.redis_client import create_pool
+from app.core.config import settings
+
+
+def test_pool_waits_when_oversubscribed():
+    async def oversubscribe():
+        pool = create_pool()
+        with patch.object(pool, "ensure_connection", new_callable=AsyncMock):
+            connections = [
+                await pool.get_connection()
+                for _ in range(settings.redis_max_connections)
+            ]
+
+            # One more than the pool holds: must wait, not raise
+            waiter = asyncio.create_task(pool.get_connection())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            await pool.release(connections[0])
+            assert await asyncio.wait_for(waiter, timeout=1) is connections[0]
+
+    asyncio.run(oversubscribe())
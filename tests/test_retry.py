@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock, patch
+import asyncio
+import httpx
+from app.gateway.retry import retry_request
+
+
+def make_client(statuses, headers=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(statuses[len(calls) - 1], headers=headers)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+def test_retries_transient_status_until_success():
+    client, calls = make_client([503, 502, 200])
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock):
+        response = asyncio.run(retry_request(client, "http://downstream/"))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    client, calls = make_client([404])
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        response = asyncio.run(retry_request(client, "http://downstream/"))
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+    mock_sleep.assert_not_awaited()
+
+
+def test_does_not_retry_non_idempotent_methods():
+    client, calls = make_client([503, 200])
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock):
+        response = asyncio.run(
+            retry_request(client, "http://downstream/", method="POST")
+        )
+
+    assert response.status_code == 503
+    assert calls == ["POST"]
+
+
+def test_backoff_uses_full_jitter_and_max_delay():
+    client, _ = make_client([503, 503, 503])
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        asyncio.run(
+            retry_request(client, "http://downstream/", base_delay=10.0, max_delay=15.0)
+        )
+
+    delays = [call.args[0] for call in mock_sleep.await_args_list]
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 10.0
+    assert 0 <= delays[1] <= 15.0
+
+
+def test_honors_retry_after_header():
+    client, _ = make_client([429, 200], headers={"Retry-After": "2"})
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        asyncio.run(retry_request(client, "http://downstream/"))
+
+    mock_sleep.assert_awaited_once_with(2.0)
+
+
+def test_honors_retry_after_http_date():
+    # A -0000 zone parses as a naive datetime; a past date means retry now
+    client, calls = make_client(
+        [503, 200], headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"}
+    )
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        response = asyncio.run(retry_request(client, "http://downstream/"))
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    mock_sleep.assert_awaited_once_with(0.0)
+
+
+def test_ignores_non_finite_retry_after():
+    client, _ = make_client([503, 200], headers={"Retry-After": "nan"})
+
+    with patch("app.gateway.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        asyncio.run(retry_request(client, "http://downstream/", base_delay=1.0))
+
+    delay = mock_sleep.await_args.args[0]
+    assert 0 <= delay <= 1.0